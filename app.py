@@ -1,9 +1,11 @@
+import time
 import streamlit as st
 import pandas as pd
-import io
-import re
-from itertools import combinations_with_replacement
-from pulp import LpProblem, LpVariable, LpMinimize, lpSum, PULP_CBC_CMD
+
+# Tempo máximo aceitável (s) para uma reexecução do script sem cálculo
+LATENCIA_ALVO_RERUN = 0.3
+
+inicio_rerun = time.perf_counter()
 
 st.set_page_config(layout="wide")
 st.markdown("<style> .block-container { max-width: 60%; } </style>", unsafe_allow_html=True)
@@ -27,7 +29,7 @@ def input_lotes_pesos():
     
     for i in range(1, num_lotes + 1):
         lote = st.sidebar.text_input(f"Nome do lote {i}", value="").replace(" ", "").replace("\t", "").replace("\n", "")
-        peso = st.sidebar.number_input(f"Peso do {lote}", min_value=0.01, value=0.01, step=0.01)
+        peso = st.sidebar.number_input(f"Peso do {lote}", min_value=0.01, value=0.01, step=0.01, key=f"peso_lote_{i}")
         lotes_pesos[lote] = peso
     
     return lotes_pesos
@@ -43,168 +45,174 @@ except ValueError:
 
 
 
-# Definições dos produtos
-produtos = {
-    "Perfil UDC Enrijecido 50x25x10x2,00x6000mm": 105,
-    "Perfil UDC Enrijecido 75x40x15x2,00x6000mm": 170,
-    "Perfil UDC Enrijecido 100x40x15x2,00x6000mm": 197,
-    "Perfil UDC Enrijecido 100x50x17x2,00x6000mm": 219,
-    "Perfil UDC Enrijecido 127x50x17x2,00x6000mm": 244,
-    "Perfil UDC Enrijecido 150x50x17x2,00x6000mm": 264,
-    "Perfil UDC Enrijecido 150x60x20x2,00x6000mm": 295,
-    "Perfil UDC Enrijecido 200x75x25x2,00x6000mm": 375,
-    "Perfil UDC Simples 50x25x2,00x6000mm": 93,
-    "Perfil UDC Simples 68x30x2,00x6000mm": 122,
-    "Perfil UDC Simples 75x40x2,00x6000mm": 148,
-    "Perfil UDC Simples 92x30x2,00x6000mm": 148,
-    "Perfil UDC Simples 100x40x2,00x6000mm": 173,
-    "Perfil UDC Simples 100x50x2,00x6000mm": 192,
-    "Perfil UDC Simples 127x50x2,00x6000mm": 217,
-    "Perfil UDC Simples 150x50x2,00x6000mm": 242,
-    "Perfil UDC Simples 200x75x2,00x6000mm": 343,
-    "Perfil UDC Simples 50x25x2,00x6000mm": 93,
-    "Perfil UDC Simples 50x25x2,25x6000mm": 93,
-    "Perfil UDC Simples 50x25x2,65x6000mm": 91,
-    "Perfil UDC Simples 50x25x3,00x6000mm": 91,
-    "Perfil UDC Simples 75x40x2,00x6000mm": 148,
-    "Perfil UDC Simples 75x40x2,25x6000mm": 148,
-    "Perfil UDC Simples 75x40x2,65x6000mm": 146,
-    "Perfil UDC Simples 75x40x3,00x6000mm": 146,
-    "Perfil UDC Simples 75x40x3,35x6000mm": 144,
-    "Perfil UDC Simples 75x40x3,75x6000mm": 143,
-    "Perfil UDC Simples 75x40x4,25x6000mm": 141,
-    "Perfil UDC Simples 75x40x4,75x6000mm": 140,
-    "Perfil UDC Simples 100x40x2,00x6000mm": 173,
-    "Perfil UDC Simples 100x40x2,25x6000mm": 173,
-    "Perfil UDC Simples 100x40x2,65x6000mm": 171,
-    "Perfil UDC Simples 100x40x3,00x6000mm": 171,
-    "Perfil UDC Simples 100x40x3,35x6000mm": 169,
-    "Perfil UDC Simples 100x40x3,75x6000mm": 168,
-    "Perfil UDC Simples 100x40x4,25x6000mm": 166,
-    "Perfil UDC Simples 100x40x4,75x6000mm": 165,
-    "Perfil UDC Simples 100x50x2,00x6000mm": 192,
-    "Perfil UDC Simples 100x50x2,25x6000mm": 192,
-    "Perfil UDC Simples 100x50x2,65x6000mm": 190,
-    "Perfil UDC Simples 100x50x3,00x6000mm": 190,
-    "Perfil UDC Simples 100x50x3,35x6000mm": 189,
-    "Perfil UDC Simples 100x50x3,75x6000mm": 188,
-    "Perfil UDC Simples 100x50x4,25x6000mm": 186,
-    "Perfil UDC Simples 100x50x4,75x6000mm": 185,
-    "Perfil UDC Simples 125x50x2,00x6000mm": 217,
-    "Perfil UDC Simples 125x50x2,25x6000mm": 216,
-    "Perfil UDC Simples 125x50x2,65x6000mm": 216,
-    "Perfil UDC Simples 125x50x3,00x6000mm": 215,
-    "Perfil UDC Simples 125x50x3,35x6000mm": 214,
-    "Perfil UDC Simples 125x50x3,75x6000mm": 213,
-    "Perfil UDC Simples 125x50x4,25x6000mm": 211,
-    "Perfil UDC Simples 125x50x4,75x6000mm": 210,
-    "Perfil UDC Simples 150x50x2,00x6000mm": 242,
-    "Perfil UDC Simples 150x50x2,25x6000mm": 242,
-    "Perfil UDC Simples 150x50x2,65x6000mm": 241,
-    "Perfil UDC Simples 150x50x3,00x6000mm": 240,
-    "Perfil UDC Simples 150x50x3,35x6000mm": 239,
-    "Perfil UDC Simples 150x50x3,75x6000mm": 238,
-    "Perfil UDC Simples 150x50x4,25x6000mm": 236,
-    "Perfil UDC Simples 150x50x4,75x6000mm": 235,
-    "Perfil UDC Simples 150x60x2,00x6000mm": 263,
-    "Perfil UDC Simples 150x60x2,25x6000mm": 263,
-    "Perfil UDC Simples 150x60x2,65x6000mm": 262,
-    "Perfil UDC Simples 150x60x3,00x6000mm": 261,
-    "Perfil UDC Simples 150x60x3,35x6000mm": 259,
-    "Perfil UDC Simples 150x60x3,75x6000mm": 258,
-    "Perfil UDC Simples 150x60x4,25x6000mm": 256,
-    "Perfil UDC Simples 150x60x4,75x6000mm": 255,
-    "Perfil UDC Simples 200x60x2,00x6000mm": 313,
-    "Perfil UDC Simples 200x60x2,25x6000mm": 313,
-    "Perfil UDC Simples 200x60x2,65x6000mm": 312,
-    "Perfil UDC Simples 200x60x3,00x6000mm": 311,
-    "Perfil UDC Simples 200x60x3,35x6000mm": 309,
-    "Perfil UDC Simples 200x60x3,75x6000mm": 308,
-    "Perfil UDC Simples 200x60x4,25x6000mm": 306,
-    "Perfil UDC Simples 200x60x4,75x6000mm": 305,
-    "Perfil UDC Simples 45X17x2,00x6000mm": 72,
-    "Perfil UDC Simples 45X17x2,25x6000mm": 71,
-    "Perfil UDC Simples 45X17x2,65x6000mm": 70,
-    "Perfil UDC Simples 45X17x3,00x6000mm": 68,
-    "Perfil UDC Simples 68x30x2,00x6000mm": 122,
-    "Perfil UDC Simples 68x30x2,25x6000mm": 121,
-    "Perfil UDC Simples 68x30x2,65x6000mm": 120,
-    "Perfil UDC Simples 68x30x3,00x6000mm": 119,
-    "Perfil UDC Simples 92x30x2,00x6000mm": 148,
-    "Perfil UDC Simples 92x30x2,25x6000mm": 147,
-    "Perfil UDC Simples 92x30x2,65x6000mm": 145,
-    "Perfil UDC Simples 92x30x3,00x6000mm": 143,
-    "Perfil UDC Simples 200x75x2,00x6000mm": 343,
-    "Perfil UDC Simples 200x75x2,25x6000mm": 343,
-    "Perfil UDC Simples 200x75x2,65x6000mm": 342,
-    "Perfil UDC Simples 200x75x3,00x6000mm": 341,
-    "Perfil UDC Simples 200x75x3,35x6000mm": 339,
-    "Perfil UDC Enrijecido 50x25x10x2,00x6000mm": 105,
-    "Perfil UDC Enrijecido 50x25x10x2,25x6000mm": 105,
-    "Perfil UDC Enrijecido 50x25x10x2,65x6000mm": 101,
-    "Perfil UDC Enrijecido 50x25x10x3,00x6000mm": 101,
-    "Perfil UDC Enrijecido 75x40x15x2,00x6000mm": 170,
-    "Perfil UDC Enrijecido 75x40x15x2,25x6000mm": 170,
-    "Perfil UDC Enrijecido 75x40x15x2,65x6000mm": 166,
-    "Perfil UDC Enrijecido 75x40x15x3,00x6000mm": 166,
-    "Perfil UDC Enrijecido 100x40x17x2,00x6000mm": 197,
-    "Perfil UDC Enrijecido 100x40x17x2,25x6000mm": 197,
-    "Perfil UDC Enrijecido 100x40x17x2,65x6000mm": 193,
-    "Perfil UDC Enrijecido 100x40x17x3,00x6000mm": 191,
-    "Perfil UDC Enrijecido 100x40x17x3,35x6000mm": 188,
-    "Perfil UDC Enrijecido 100x50x17x2,00x6000mm": 219,
-    "Perfil UDC Enrijecido 100x50x17x2,25x6000mm": 217,
-    "Perfil UDC Enrijecido 100x50x17x2,65x6000mm": 215,
-    "Perfil UDC Enrijecido 100x50x17x3,00x6000mm": 214,
-    "Perfil UDC Enrijecido 100x50x17x3,35x6000mm": 213,
-    "Perfil UDC Enrijecido 125x50x17x2,00x6000mm": 244,
-    "Perfil UDC Enrijecido 125x50x17x2,25x6000mm": 242,
-    "Perfil UDC Enrijecido 125x50x17x2,65x6000mm": 240,
-    "Perfil UDC Enrijecido 125x50x17x3,00x6000mm": 239,
-    "Perfil UDC Enrijecido 125x50x17x3,35x6000mm": 237,
-    "Perfil UDC Enrijecido 150x50x17x2,00x6000mm": 264,
-    "Perfil UDC Enrijecido 150x50x17x2,25x6000mm": 264,
-    "Perfil UDC Enrijecido 150x50x17x2,65x6000mm": 259,
-    "Perfil UDC Enrijecido 150x50x17x3,00x6000mm": 259,
-    "Perfil UDC Enrijecido 150x50x17x3,35x6000mm": 257,
-    "Perfil UDC Enrijecido 150x60x20x2,00x6000mm": 295,
-    "Perfil UDC Enrijecido 150x60x20x2,25x6000mm": 293,
-    "Perfil UDC Enrijecido 150x60x20x2,65x6000mm": 293,
-    "Perfil UDC Enrijecido 150x60x20x3,00x6000mm": 291,
-    "Perfil UDC Enrijecido 150x60x20x3,35x6000mm": 288,
-    "Perfil UDC Enrijecido 150x60x20x3,75x6000mm": 286,
-    "Perfil UDC Enrijecido 150x60x20x4,25x6000mm": 282,
-    "Perfil UDC Enrijecido 150x60x20x4,75x6000mm": 280,
-    "Perfil UDC Enrijecido 200x60x20x2,00x6000mm": 345,
-    "Perfil UDC Enrijecido 200x60x20x2,25x6000mm": 345,
-    "Perfil UDC Enrijecido 200x60x20x2,65x6000mm": 341,
-    "Perfil UDC Enrijecido 200x60x20x3,00x6000mm": 341,
-    "Perfil UDC Enrijecido 200x60x20x3,35x6000mm": 338,
-    "Perfil UDC Enrijecido 200x60x20x3,75x6000mm": 336,
-    "Perfil UDC Enrijecido 200x60x20x4,25x6000mm": 332,
-    "Perfil UDC Enrijecido 200x60x20x4,75x6000mm": 330,
-    "Perfil UDC Enrijecido 200x75x20x2,00x6000mm": 375,
-    "Perfil UDC Enrijecido 200x75x20x2,25x6000mm": 375,
-    "Perfil UDC Enrijecido 200x75x20x2,65x6000mm": 371,
-    "Perfil UDC Enrijecido 200x75x20x3,00x6000mm": 371,
-    "Perfil UDC Enrijecido 200x75x20x3,35x6000mm": 368
+# Definições dos produtos (catálogo estático, montado uma única vez e copiado para cada sessão)
+@st.cache_data
+def carregar_catalogo():
+    produtos = {
+        "Perfil UDC Enrijecido 50x25x10x2,00x6000mm": 105,
+        "Perfil UDC Enrijecido 75x40x15x2,00x6000mm": 170,
+        "Perfil UDC Enrijecido 100x40x15x2,00x6000mm": 197,
+        "Perfil UDC Enrijecido 100x50x17x2,00x6000mm": 219,
+        "Perfil UDC Enrijecido 127x50x17x2,00x6000mm": 244,
+        "Perfil UDC Enrijecido 150x50x17x2,00x6000mm": 264,
+        "Perfil UDC Enrijecido 150x60x20x2,00x6000mm": 295,
+        "Perfil UDC Enrijecido 200x75x25x2,00x6000mm": 375,
+        "Perfil UDC Simples 50x25x2,00x6000mm": 93,
+        "Perfil UDC Simples 68x30x2,00x6000mm": 122,
+        "Perfil UDC Simples 75x40x2,00x6000mm": 148,
+        "Perfil UDC Simples 92x30x2,00x6000mm": 148,
+        "Perfil UDC Simples 100x40x2,00x6000mm": 173,
+        "Perfil UDC Simples 100x50x2,00x6000mm": 192,
+        "Perfil UDC Simples 127x50x2,00x6000mm": 217,
+        "Perfil UDC Simples 150x50x2,00x6000mm": 242,
+        "Perfil UDC Simples 200x75x2,00x6000mm": 343,
+        "Perfil UDC Simples 50x25x2,00x6000mm": 93,
+        "Perfil UDC Simples 50x25x2,25x6000mm": 93,
+        "Perfil UDC Simples 50x25x2,65x6000mm": 91,
+        "Perfil UDC Simples 50x25x3,00x6000mm": 91,
+        "Perfil UDC Simples 75x40x2,00x6000mm": 148,
+        "Perfil UDC Simples 75x40x2,25x6000mm": 148,
+        "Perfil UDC Simples 75x40x2,65x6000mm": 146,
+        "Perfil UDC Simples 75x40x3,00x6000mm": 146,
+        "Perfil UDC Simples 75x40x3,35x6000mm": 144,
+        "Perfil UDC Simples 75x40x3,75x6000mm": 143,
+        "Perfil UDC Simples 75x40x4,25x6000mm": 141,
+        "Perfil UDC Simples 75x40x4,75x6000mm": 140,
+        "Perfil UDC Simples 100x40x2,00x6000mm": 173,
+        "Perfil UDC Simples 100x40x2,25x6000mm": 173,
+        "Perfil UDC Simples 100x40x2,65x6000mm": 171,
+        "Perfil UDC Simples 100x40x3,00x6000mm": 171,
+        "Perfil UDC Simples 100x40x3,35x6000mm": 169,
+        "Perfil UDC Simples 100x40x3,75x6000mm": 168,
+        "Perfil UDC Simples 100x40x4,25x6000mm": 166,
+        "Perfil UDC Simples 100x40x4,75x6000mm": 165,
+        "Perfil UDC Simples 100x50x2,00x6000mm": 192,
+        "Perfil UDC Simples 100x50x2,25x6000mm": 192,
+        "Perfil UDC Simples 100x50x2,65x6000mm": 190,
+        "Perfil UDC Simples 100x50x3,00x6000mm": 190,
+        "Perfil UDC Simples 100x50x3,35x6000mm": 189,
+        "Perfil UDC Simples 100x50x3,75x6000mm": 188,
+        "Perfil UDC Simples 100x50x4,25x6000mm": 186,
+        "Perfil UDC Simples 100x50x4,75x6000mm": 185,
+        "Perfil UDC Simples 125x50x2,00x6000mm": 217,
+        "Perfil UDC Simples 125x50x2,25x6000mm": 216,
+        "Perfil UDC Simples 125x50x2,65x6000mm": 216,
+        "Perfil UDC Simples 125x50x3,00x6000mm": 215,
+        "Perfil UDC Simples 125x50x3,35x6000mm": 214,
+        "Perfil UDC Simples 125x50x3,75x6000mm": 213,
+        "Perfil UDC Simples 125x50x4,25x6000mm": 211,
+        "Perfil UDC Simples 125x50x4,75x6000mm": 210,
+        "Perfil UDC Simples 150x50x2,00x6000mm": 242,
+        "Perfil UDC Simples 150x50x2,25x6000mm": 242,
+        "Perfil UDC Simples 150x50x2,65x6000mm": 241,
+        "Perfil UDC Simples 150x50x3,00x6000mm": 240,
+        "Perfil UDC Simples 150x50x3,35x6000mm": 239,
+        "Perfil UDC Simples 150x50x3,75x6000mm": 238,
+        "Perfil UDC Simples 150x50x4,25x6000mm": 236,
+        "Perfil UDC Simples 150x50x4,75x6000mm": 235,
+        "Perfil UDC Simples 150x60x2,00x6000mm": 263,
+        "Perfil UDC Simples 150x60x2,25x6000mm": 263,
+        "Perfil UDC Simples 150x60x2,65x6000mm": 262,
+        "Perfil UDC Simples 150x60x3,00x6000mm": 261,
+        "Perfil UDC Simples 150x60x3,35x6000mm": 259,
+        "Perfil UDC Simples 150x60x3,75x6000mm": 258,
+        "Perfil UDC Simples 150x60x4,25x6000mm": 256,
+        "Perfil UDC Simples 150x60x4,75x6000mm": 255,
+        "Perfil UDC Simples 200x60x2,00x6000mm": 313,
+        "Perfil UDC Simples 200x60x2,25x6000mm": 313,
+        "Perfil UDC Simples 200x60x2,65x6000mm": 312,
+        "Perfil UDC Simples 200x60x3,00x6000mm": 311,
+        "Perfil UDC Simples 200x60x3,35x6000mm": 309,
+        "Perfil UDC Simples 200x60x3,75x6000mm": 308,
+        "Perfil UDC Simples 200x60x4,25x6000mm": 306,
+        "Perfil UDC Simples 200x60x4,75x6000mm": 305,
+        "Perfil UDC Simples 45X17x2,00x6000mm": 72,
+        "Perfil UDC Simples 45X17x2,25x6000mm": 71,
+        "Perfil UDC Simples 45X17x2,65x6000mm": 70,
+        "Perfil UDC Simples 45X17x3,00x6000mm": 68,
+        "Perfil UDC Simples 68x30x2,00x6000mm": 122,
+        "Perfil UDC Simples 68x30x2,25x6000mm": 121,
+        "Perfil UDC Simples 68x30x2,65x6000mm": 120,
+        "Perfil UDC Simples 68x30x3,00x6000mm": 119,
+        "Perfil UDC Simples 92x30x2,00x6000mm": 148,
+        "Perfil UDC Simples 92x30x2,25x6000mm": 147,
+        "Perfil UDC Simples 92x30x2,65x6000mm": 145,
+        "Perfil UDC Simples 92x30x3,00x6000mm": 143,
+        "Perfil UDC Simples 200x75x2,00x6000mm": 343,
+        "Perfil UDC Simples 200x75x2,25x6000mm": 343,
+        "Perfil UDC Simples 200x75x2,65x6000mm": 342,
+        "Perfil UDC Simples 200x75x3,00x6000mm": 341,
+        "Perfil UDC Simples 200x75x3,35x6000mm": 339,
+        "Perfil UDC Enrijecido 50x25x10x2,00x6000mm": 105,
+        "Perfil UDC Enrijecido 50x25x10x2,25x6000mm": 105,
+        "Perfil UDC Enrijecido 50x25x10x2,65x6000mm": 101,
+        "Perfil UDC Enrijecido 50x25x10x3,00x6000mm": 101,
+        "Perfil UDC Enrijecido 75x40x15x2,00x6000mm": 170,
+        "Perfil UDC Enrijecido 75x40x15x2,25x6000mm": 170,
+        "Perfil UDC Enrijecido 75x40x15x2,65x6000mm": 166,
+        "Perfil UDC Enrijecido 75x40x15x3,00x6000mm": 166,
+        "Perfil UDC Enrijecido 100x40x17x2,00x6000mm": 197,
+        "Perfil UDC Enrijecido 100x40x17x2,25x6000mm": 197,
+        "Perfil UDC Enrijecido 100x40x17x2,65x6000mm": 193,
+        "Perfil UDC Enrijecido 100x40x17x3,00x6000mm": 191,
+        "Perfil UDC Enrijecido 100x40x17x3,35x6000mm": 188,
+        "Perfil UDC Enrijecido 100x50x17x2,00x6000mm": 219,
+        "Perfil UDC Enrijecido 100x50x17x2,25x6000mm": 217,
+        "Perfil UDC Enrijecido 100x50x17x2,65x6000mm": 215,
+        "Perfil UDC Enrijecido 100x50x17x3,00x6000mm": 214,
+        "Perfil UDC Enrijecido 100x50x17x3,35x6000mm": 213,
+        "Perfil UDC Enrijecido 125x50x17x2,00x6000mm": 244,
+        "Perfil UDC Enrijecido 125x50x17x2,25x6000mm": 242,
+        "Perfil UDC Enrijecido 125x50x17x2,65x6000mm": 240,
+        "Perfil UDC Enrijecido 125x50x17x3,00x6000mm": 239,
+        "Perfil UDC Enrijecido 125x50x17x3,35x6000mm": 237,
+        "Perfil UDC Enrijecido 150x50x17x2,00x6000mm": 264,
+        "Perfil UDC Enrijecido 150x50x17x2,25x6000mm": 264,
+        "Perfil UDC Enrijecido 150x50x17x2,65x6000mm": 259,
+        "Perfil UDC Enrijecido 150x50x17x3,00x6000mm": 259,
+        "Perfil UDC Enrijecido 150x50x17x3,35x6000mm": 257,
+        "Perfil UDC Enrijecido 150x60x20x2,00x6000mm": 295,
+        "Perfil UDC Enrijecido 150x60x20x2,25x6000mm": 293,
+        "Perfil UDC Enrijecido 150x60x20x2,65x6000mm": 293,
+        "Perfil UDC Enrijecido 150x60x20x3,00x6000mm": 291,
+        "Perfil UDC Enrijecido 150x60x20x3,35x6000mm": 288,
+        "Perfil UDC Enrijecido 150x60x20x3,75x6000mm": 286,
+        "Perfil UDC Enrijecido 150x60x20x4,25x6000mm": 282,
+        "Perfil UDC Enrijecido 150x60x20x4,75x6000mm": 280,
+        "Perfil UDC Enrijecido 200x60x20x2,00x6000mm": 345,
+        "Perfil UDC Enrijecido 200x60x20x2,25x6000mm": 345,
+        "Perfil UDC Enrijecido 200x60x20x2,65x6000mm": 341,
+        "Perfil UDC Enrijecido 200x60x20x3,00x6000mm": 341,
+        "Perfil UDC Enrijecido 200x60x20x3,35x6000mm": 338,
+        "Perfil UDC Enrijecido 200x60x20x3,75x6000mm": 336,
+        "Perfil UDC Enrijecido 200x60x20x4,25x6000mm": 332,
+        "Perfil UDC Enrijecido 200x60x20x4,75x6000mm": 330,
+        "Perfil UDC Enrijecido 200x75x20x2,00x6000mm": 375,
+        "Perfil UDC Enrijecido 200x75x20x2,25x6000mm": 375,
+        "Perfil UDC Enrijecido 200x75x20x2,65x6000mm": 371,
+        "Perfil UDC Enrijecido 200x75x20x3,00x6000mm": 371,
+        "Perfil UDC Enrijecido 200x75x20x3,35x6000mm": 368
+        
     
-
+        
     
+    }
 
-}
-
-larguras_slitters = list(produtos.values())
+    larguras_slitters = list(produtos.values())
 
-# Entrada de demandas como seleção múltipla
-# Entrada de demandas com barra de rolagem dentro do expander
-with st.expander("Selecione os produtos e defina os pesos"):
     df_produtos = pd.DataFrame({
         "Produto": list(produtos.keys()),
         "Selecionado": [False] * len(produtos),
         "Peso (kg)": [0] * len(produtos)  # Agora o nome da coluna é "Peso"
     })
 
+    return produtos, larguras_slitters, df_produtos
+
+produtos, larguras_slitters, df_produtos = carregar_catalogo()
+
+# Entrada de demandas como seleção múltipla
+# Entrada de demandas com barra de rolagem dentro do expander
+with st.expander("Selecione os produtos e defina os pesos"):
     # Editor de dados com barra de rolagem automática
     df_editado = st.data_editor(
         df_produtos,
@@ -246,50 +254,61 @@ def encontra_combinacoes_possiveis(larguras_slitters, largura_bobina):
     buscar_combinacao([], 0, 0)
     return combinacoes
 
-def resolver_problema_corte(larguras_slitters, largura_bobina, _bobina, demand):
-    proporcao = _bobina / largura_bobina
-
-    # Filtrar larguras_slitters com base na demanda
-    larguras_validas = set(demand["Largura"])
+@st.cache_data(max_entries=64)
+def combinacoes_da_demanda(larguras_slitters, largura_bobina, larguras_validas):
+    # Padrões de corte dependem apenas das larguras e do slitter, não dos limites
+    larguras_validas = set(larguras_validas)
     larguras_slitters = [larg for larg in larguras_slitters if larg in larguras_validas]
 
     # Encontrar combinações possíveis
     combinacoes = encontra_combinacoes_possiveis(larguras_slitters, largura_bobina)
 
-    if not combinacoes:
-        return None
-
     # Filtrar combinações para conter apenas larguras presentes na demanda
-    combinacoes_filtradas = [
-        comb for comb in combinacoes if set(comb).issubset(larguras_validas)
-    ]
+    return [comb for comb in combinacoes if set(comb).issubset(larguras_validas)]
 
-    if not combinacoes_filtradas:
-        return None
+def agrupar_demanda(demand):
+    # Produtos diferentes podem ter a mesma largura; o modelo trabalha com o peso somado por largura
+    return demand.groupby("Largura")["Peso (kg)"].sum().to_dict()
+
+def montar_modelo_corte(combinacoes_filtradas, proporcao, demanda_por_largura, limite_inferior, limite_superior):
+    from pulp import LpProblem, LpVariable, LpMinimize, lpSum
 
     problema = LpProblem("Problema_de_Corte", LpMinimize)
     x = LpVariable.dicts("Plano", range(len(combinacoes_filtradas)), lowBound=0, cat="Integer")
 
     problema += lpSum(x[i] for i in range(len(combinacoes_filtradas))), "Minimizar_Bobinas"
 
-    for _, row in demand.iterrows():
-        largura = row["Largura"]
-        peso_necessario = row["Peso (kg)"]
-
-        problema += (
-            lpSum(
-                x[i] * combinacao.count(largura) * proporcao * largura
-                for i, combinacao in enumerate(combinacoes_filtradas)
-            ) >= peso_necessario * limite_inferior,
-            f"Atender_Minima_{largura}",
-        )
-        problema += (
-            lpSum(
-                x[i] * combinacao.count(largura) * proporcao * largura
-                for i, combinacao in enumerate(combinacoes_filtradas)
-            ) <= peso_necessario * limite_superior,
-            f"Atender_Maxima_{largura}",
+    for largura, peso_necessario in demanda_por_largura.items():
+        producao = lpSum(
+            x[i] * combinacao.count(largura) * proporcao * largura
+            for i, combinacao in enumerate(combinacoes_filtradas)
         )
+        problema += producao >= peso_necessario * limite_inferior, f"Atender_Minima_{largura}"
+        problema += producao <= peso_necessario * limite_superior, f"Atender_Maxima_{largura}"
+
+    return problema, x
+
+def ajustar_limites(problema, demanda_por_largura, limite_inferior, limite_superior):
+    # Altera apenas o lado direito das restrições, sem reconstruir o modelo
+    for largura, peso_necessario in demanda_por_largura.items():
+        problema.constraints[f"Atender_Minima_{largura}"].changeRHS(peso_necessario * limite_inferior)
+        problema.constraints[f"Atender_Maxima_{largura}"].changeRHS(peso_necessario * limite_superior)
+
+def resolver_problema_corte(larguras_slitters, largura_bobina, _bobina, demand, limite_inferior, limite_superior):
+    # Importado apenas quando o cálculo é executado, fora do caminho de reexecução
+    from pulp import PULP_CBC_CMD
+
+    proporcao = _bobina / largura_bobina
+    demanda_por_largura = agrupar_demanda(demand)
+
+    combinacoes_filtradas = combinacoes_da_demanda(
+        tuple(larguras_slitters), largura_bobina, tuple(sorted(demanda_por_largura))
+    )
+
+    if not combinacoes_filtradas:
+        return None
+
+    problema, x = montar_modelo_corte(combinacoes_filtradas, proporcao, demanda_por_largura, limite_inferior, limite_superior)
 
     problema.solve(PULP_CBC_CMD(msg=False))
 
@@ -320,6 +339,248 @@ def resolver_problema_corte(larguras_slitters, largura_bobina, _bobina, demand):
 
 
 
+# Tempo máximo (s) da 2ª etapa de cada cenário; ao estourar, fica o melhor plano já encontrado
+TEMPO_LIMITE_DESEMPATE = 0.1
+
+def montar_modelo_desempate(combinacoes_filtradas, proporcao, demanda_por_largura, limite_inferior, limite_superior):
+    from pulp import LpVariable, lpSum
+
+    problema, x = montar_modelo_corte(combinacoes_filtradas, proporcao, demanda_por_largura, limite_inferior, limite_superior)
+
+    # O número de bobinas é fixado no mínimo da 1ª etapa pelo lado direito desta restrição
+    problema += lpSum(x.values()) == 0, "Fixar_Bobinas"
+
+    sobreproducao = {}
+    for largura, peso_necessario in demanda_por_largura.items():
+        producao = lpSum(
+            x[i] * combinacao.count(largura) * proporcao * largura
+            for i, combinacao in enumerate(combinacoes_filtradas)
+        )
+        sobreproducao[largura] = LpVariable(f"Sobreproducao_{largura}", lowBound=0)
+        problema += sobreproducao[largura] >= producao - peso_necessario, f"Definir_Sobreproducao_{largura}"
+
+    problema.setObjective(lpSum(sobreproducao.values()))
+
+    return problema, x, sobreproducao
+
+def varrer_cenarios(larguras_slitters, larguras_bobina, _bobina, demand, faixas):
+    from concurrent.futures import ThreadPoolExecutor
+    import math
+    import os
+    from pulp import PULP_CBC_CMD, LpSolutionOptimal
+
+    demanda_por_largura = agrupar_demanda(demand)
+    demanda_total = sum(demanda_por_largura.values())
+    larguras_validas = tuple(sorted(demanda_por_largura))
+    num_workers = min(len(faixas) * len(larguras_bobina), os.cpu_count() or 1) or 1
+
+    # Padrões buscados uma vez por largura de slitter (no cache, fora das threads);
+    # as faixas de cada largura são repartidas entre os workers
+    tarefas = []
+    for largura_bobina in larguras_bobina:
+        combinacoes_filtradas = combinacoes_da_demanda(tuple(larguras_slitters), largura_bobina, larguras_validas)
+        partes = max(1, num_workers // len(larguras_bobina))
+        for k in range(min(partes, len(faixas))):
+            tarefas.append((largura_bobina, combinacoes_filtradas, faixas[k::partes]))
+
+    def resolver_tarefa(tarefa):
+        largura_bobina, combinacoes_filtradas, faixas_tarefa = tarefa
+        proporcao = _bobina / largura_bobina
+
+        if combinacoes_filtradas:
+            # Um modelo por etapa em cada worker; entre os cenários mudam apenas os limites.
+            # A 1ª etapa usa o mesmo modelo de resolver_problema_corte, sem as restrições do desempate
+            problema_bobinas, x_bobinas = montar_modelo_corte(
+                combinacoes_filtradas, proporcao, demanda_por_largura, *faixas_tarefa[0]
+            )
+            problema, x, sobreproducao = montar_modelo_desempate(
+                combinacoes_filtradas, proporcao, demanda_por_largura, *faixas_tarefa[0]
+            )
+
+        def pesos_produzidos(quantidades):
+            pesos_totais = {largura: 0 for largura in demanda_por_largura}
+            for quantidade, combinacao in zip(quantidades, combinacoes_filtradas):
+                for largura in combinacao:
+                    pesos_totais[largura] += quantidade * largura * proporcao
+            return pesos_totais
+
+        def calcular_sobreproducao(pesos_totais):
+            return sum(
+                max(pesos_totais[largura] - peso_planejado, 0)
+                for largura, peso_planejado in demanda_por_largura.items()
+            )
+
+        def plano_cabe(pesos_totais, limite_inferior, limite_superior):
+            # Sem folga: o plano precisa respeitar os mesmos limites que o modelo da faixa impõe
+            return all(
+                peso_planejado * limite_inferior <= pesos_totais[largura] <= peso_planejado * limite_superior
+                for largura, peso_planejado in demanda_por_largura.items()
+            )
+
+        def carregar_plano(quantidades):
+            # Valores iniciais para o warm start da 2ª etapa
+            pesos_totais = pesos_produzidos(quantidades)
+            for i, quantidade in enumerate(quantidades):
+                x[i].setInitialValue(quantidade)
+            for largura, peso_planejado in demanda_por_largura.items():
+                sobreproducao[largura].setInitialValue(max(pesos_totais[largura] - peso_planejado, 0))
+
+        # Faixas mais largas primeiro: o ótimo de uma faixa que contém a atual, se couber nela,
+        # também é o ótimo da atual; e se a faixa maior é inviável, a contida também é
+        resolvidas = []
+        linhas = []
+        for limite_inferior, limite_superior in sorted(faixas_tarefa, key=lambda faixa: faixa[0] - faixa[1]):
+            linha = {
+                "Largura Slitter (mm)": largura_bobina,
+                "Limite Inferior (%)": round(limite_inferior * 100, 1),
+                "Limite Superior (%)": round(limite_superior * 100, 1),
+                "Bobinas": None,
+                "Sobreprodução (kg)": None,
+                "Dispersão do Atendimento (%)": None,
+                "Desempate Ótimo": None,
+            }
+            linhas.append(linha)
+
+            if not combinacoes_filtradas:
+                continue
+
+            contem = [
+                resolvida for resolvida in resolvidas
+                if resolvida["inferior"] <= limite_inferior and resolvida["superior"] >= limite_superior
+            ]
+            if any(resolvida["quantidades"] is None for resolvida in contem):
+                continue
+
+            # Sem desempate ótimo na faixa maior, o plano dela é reaproveitado como o melhor conhecido
+            cabem = [
+                resolvida for resolvida in contem
+                if plano_cabe(resolvida["pesos"], limite_inferior, limite_superior)
+            ]
+            reaproveitada = next(
+                (resolvida for resolvida in cabem if resolvida["linha"]["Desempate Ótimo"]),
+                cabem[0] if cabem else None,
+            )
+            if reaproveitada is not None:
+                for coluna in ("Bobinas", "Sobreprodução (kg)", "Dispersão do Atendimento (%)", "Desempate Ótimo"):
+                    linha[coluna] = reaproveitada["linha"][coluna]
+                continue
+
+            ajustar_limites(problema, demanda_por_largura, limite_inferior, limite_superior)
+            ajustar_limites(problema_bobinas, demanda_por_largura, limite_inferior, limite_superior)
+
+            # 1ª etapa: mínimo de bobinas. Uma faixa contida nunca usa menos bobinas que a que a contém,
+            # nem menos que o necessário para o limite inferior; se um plano já resolvido cabe na faixa
+            # com esse mínimo, ele dispensa a 1ª etapa
+            bobinas_minimas = max(
+                [math.ceil(demanda_total * limite_inferior / _bobina - 1e-9)]
+                + [resolvida["linha"]["Bobinas"] for resolvida in contem]
+            )
+            candidata = next(
+                (resolvida for resolvida in resolvidas
+                 if resolvida["quantidades"] is not None
+                 and sum(resolvida["quantidades"]) == bobinas_minimas
+                 and plano_cabe(resolvida["pesos"], limite_inferior, limite_superior)),
+                None,
+            )
+
+            if candidata is not None:
+                quantidades = candidata["quantidades"]
+                carregar_plano(quantidades)
+            else:
+                problema_bobinas.solve(PULP_CBC_CMD(msg=False))
+
+                if problema_bobinas.status != 1:
+                    resolvidas.append({"inferior": limite_inferior, "superior": limite_superior, "quantidades": None})
+                    continue
+
+                quantidades = [round(x_bobinas[i].varValue or 0) for i in range(len(combinacoes_filtradas))]
+                carregar_plano(quantidades)
+
+            bobinas = sum(quantidades)
+            pesos_totais = pesos_produzidos(quantidades)
+            desempate_otimo = True
+
+            # 2ª etapa: com as bobinas fixadas, menor sobreprodução. Ela nunca fica abaixo de
+            # bobinas * _bobina - demanda_total; se o plano atual já atinge esse piso, é ótimo
+            piso_sobreproducao = max(bobinas * _bobina - demanda_total, 0)
+            if calcular_sobreproducao(pesos_totais) > piso_sobreproducao + 1e-6:
+                problema.constraints["Fixar_Bobinas"].changeRHS(bobinas)
+                # Sem cortes: o limitante da sobreprodução é fraco e os cortes gastam o tempo sem fechá-lo;
+                # o CBC chega antes a bons planos pelas heurísticas
+                problema.solve(PULP_CBC_CMD(msg=False, warmStart=True, timeLimit=TEMPO_LIMITE_DESEMPATE, cuts=False))
+
+                # Sem ótimo comprovado (tempo esgotado ou falha), fica o melhor entre o plano
+                # encontrado pelo CBC e o plano da 1ª etapa
+                desempate_otimo = problema.status == 1 and problema.sol_status == LpSolutionOptimal
+                if problema.status == 1:
+                    quantidades_desempate = [round(x[i].varValue or 0) for i in range(len(combinacoes_filtradas))]
+                    pesos_desempate = pesos_produzidos(quantidades_desempate)
+                    if (sum(quantidades_desempate) == bobinas
+                            and calcular_sobreproducao(pesos_desempate) <= calcular_sobreproducao(pesos_totais)):
+                        quantidades, pesos_totais = quantidades_desempate, pesos_desempate
+                    else:
+                        desempate_otimo = False
+
+            atendimentos = [
+                pesos_totais[largura] / peso_planejado * 100
+                for largura, peso_planejado in demanda_por_largura.items()
+                if peso_planejado > 0
+            ]
+
+            linha["Bobinas"] = bobinas
+            linha["Sobreprodução (kg)"] = round(calcular_sobreproducao(pesos_totais), 0)
+            linha["Dispersão do Atendimento (%)"] = round(max(atendimentos) - min(atendimentos), 1) if atendimentos else 0
+            linha["Desempate Ótimo"] = desempate_otimo
+            resolvidas.append({
+                "inferior": limite_inferior,
+                "superior": limite_superior,
+                "quantidades": quantidades,
+                "pesos": pesos_totais,
+                "linha": linha,
+            })
+
+        return linhas
+
+    # O CBC roda em subprocesso, então threads bastam para resolver em paralelo
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        linhas = [linha for linhas_tarefa in executor.map(resolver_tarefa, tarefas) for linha in linhas_tarefa]
+
+    # O plano de uma faixa contida também cabe na faixa maior; se o desempate da maior parou no
+    # tempo limite com sobreprodução pior para as mesmas bobinas, ela fica com o plano da contida
+    for linha in linhas:
+        if linha["Desempate Ótimo"] is not False:
+            continue
+        melhores = [
+            contida for contida in linhas
+            if contida["Largura Slitter (mm)"] == linha["Largura Slitter (mm)"]
+            and contida["Limite Inferior (%)"] >= linha["Limite Inferior (%)"]
+            and contida["Limite Superior (%)"] <= linha["Limite Superior (%)"]
+            and contida["Bobinas"] == linha["Bobinas"]
+            and contida["Sobreprodução (kg)"] < linha["Sobreprodução (kg)"]
+        ]
+        if melhores:
+            melhor = min(melhores, key=lambda contida: contida["Sobreprodução (kg)"])
+            linha["Sobreprodução (kg)"] = melhor["Sobreprodução (kg)"]
+            linha["Dispersão do Atendimento (%)"] = melhor["Dispersão do Atendimento (%)"]
+
+    # A dispersão é apenas informativa: o modelo não a otimiza, então não entra no critério de Pareto.
+    # Em linhas sem desempate ótimo, a sobreprodução é a do melhor plano achado dentro do tempo limite
+    return marcar_pareto(pd.DataFrame(linhas), ["Bobinas", "Sobreprodução (kg)"])
+
+def marcar_pareto(df, colunas):
+    # Um cenário é Pareto se nenhum outro viável é melhor ou igual em todos os critérios e melhor em algum
+    viaveis = df.dropna(subset=colunas)
+    df["Pareto"] = False
+
+    for indice, linha in viaveis.iterrows():
+        melhor_ou_igual = (viaveis[colunas] <= linha[colunas]).all(axis=1)
+        estritamente_melhor = (viaveis[colunas] < linha[colunas]).any(axis=1)
+        df.loc[indice, "Pareto"] = not (melhor_ou_igual & estritamente_melhor).any()
+
+    return df.sort_values(["Pareto"] + colunas, ascending=[False] + [True] * len(colunas)).reset_index(drop=True)
+
+
+
 def gerar_tabela_final(resultado, demand, proporcao):
     # Inicializa pesos_totais com todas as larguras e produtos do demand
     pesos_totais = {row["Largura"]: 0 for _, row in demand.iterrows()}
@@ -424,7 +685,9 @@ if "melhor_largura" not in st.session_state:
 if "tabela_final" not in st.session_state:
     st.session_state.tabela_final = None
 
-if st.button("Calcular"):
+calcular = st.button("Calcular")
+
+if calcular:
     if demand.empty:
         st.error("Nenhuma demanda selecionada. Selecione ao menos um produto.")
     else:
@@ -432,7 +695,7 @@ if st.button("Calcular"):
         melhor_largura = None
 
         for largura_bobina in larguras_bobina:
-            resultado = resolver_problema_corte(larguras_slitters, largura_bobina, peso_bobina, demand)
+            resultado = resolver_problema_corte(larguras_slitters, largura_bobina, peso_bobina, demand, limite_inferior, limite_superior)
 
             if resultado is not None:
                 if melhor_resultado is None or resultado["Quantidade"].sum() < melhor_resultado["Quantidade"].sum():
@@ -457,10 +720,50 @@ if st.button("Calcular"):
             st.subheader("Tabela Final")
             st.dataframe(tabela_final)
 
+# Varredura de cenários: grade de limites e larguras de slitter avaliada de uma vez
+with st.expander("Varredura de Cenários"):
+    # Valores separados por ";" para que a vírgula possa ser usada como separador decimal (ex.: 92,5)
+    limites_inferiores_varredura = st.text_input("Limites Inferiores (%) - separados por ponto e vírgula", "85; 90; 95")
+    limites_superiores_varredura = st.text_input("Limites Superiores (%) - separados por ponto e vírgula", "110; 120; 130")
+    larguras_varredura = st.text_input("Larguras do Slitter (mm) - separadas por ponto e vírgula", str(larguras_bobina[0]))
+
+    varrer = st.button("Varrer Cenários")
+
+    if varrer:
+        try:
+            inferiores = [float(v.replace(",", ".")) / 100 for v in limites_inferiores_varredura.split(";") if v.strip()]
+            superiores = [float(v.replace(",", ".")) / 100 for v in limites_superiores_varredura.split(";") if v.strip()]
+            larguras_cenarios = [int(v) for v in larguras_varredura.split(";") if v.strip()]
+            faixas = [(inf, sup) for inf in inferiores for sup in superiores if inf < sup]
+            entrada_valida = all(v > 0 for v in inferiores + superiores + larguras_cenarios)
+        except ValueError:
+            entrada_valida = False
+
+        if not entrada_valida:
+            st.error("Os limites e larguras da varredura devem ser números positivos separados por ponto e vírgula.")
+        elif demand.empty:
+            st.error("Nenhuma demanda selecionada. Selecione ao menos um produto.")
+        elif not faixas or not larguras_cenarios:
+            st.error("Informe ao menos uma faixa válida (limite inferior menor que o superior) e uma largura.")
+        else:
+            df_cenarios = varrer_cenarios(larguras_slitters, larguras_cenarios, peso_bobina, demand, faixas)
+
+            st.subheader("Relatório de Pareto")
+            st.dataframe(df_cenarios, use_container_width=True, hide_index=True)
+
+gerar_arquivos = False
+
 if st.session_state.calculos_feitos:
     lotes_pesos = input_lotes_pesos()
     
-    if st.button("Gerar Arquivos") and lotes_pesos:
+    gerar_arquivos = st.button("Gerar Arquivos")
+
+    if gerar_arquivos and lotes_pesos:
+        # Módulos usados apenas na geração dos arquivos
+        import ast
+        import io
+        import re
+
         melhor_resultado = st.session_state.melhor_resultado
         melhor_largura = st.session_state.melhor_largura
         tabela_final = st.session_state.tabela_final
@@ -680,3 +983,9 @@ ________________________________________________________________________________
 
 
   
+
+
+# Medição da latência da reexecução; execuções com cálculo ficam de fora do alvo
+tempo_rerun = time.perf_counter() - inicio_rerun
+if not (calcular or varrer or gerar_arquivos) and tempo_rerun > LATENCIA_ALVO_RERUN:
+    st.sidebar.caption(f"Reexecução em {tempo_rerun:.2f} s (alvo: {LATENCIA_ALVO_RERUN:.2f} s)")